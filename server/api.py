@@ -1,12 +1,13 @@
 import flask
 import flask_restful
 import json
+import string
 
 from enum import Enum
 from flask_restful import reqparse, Resource
 from http import HTTPStatus
 from marshmallow import fields, post_load, Schema, validate
-from typing import Dict, Tuple, Type, List
+from typing import Dict, Tuple, Type, List, Optional, Union
 
 # TODO(j0n3lson) Consider using setup.py
 # (https://www.educative.io/answers/what-is-setuppy) and centralizing the
@@ -51,6 +52,64 @@ class UserType(Enum):
     ADMIN = 2
 
 
+class RejectionTemplate():
+    '''A prebuilt JSON response for an expected rejection.
+
+    Some rejections (e.g. not your turn) happen on a large share of requests.
+    Raising via flask_restful.abort() for those means unwinding through
+    Flask-RESTful's error handling every time, so instead handlers return a
+    response built from one of these. The body is serialized the way
+    Flask-RESTful's output_json() would, honouring RESTFUL_JSON and the
+    indentation used in debug mode, once per distinct setting. After that each
+    render only fills in the placeholders. Placeholders use string.Template
+    syntax, e.g. $username.
+    '''
+
+    def __init__(self, status: HTTPStatus, message: str):
+        self._status = status
+        self._message = message
+        # Serialized bodies keyed by the JSON settings they were built with.
+        self._bodies: Dict[tuple, string.Template] = dict()
+
+    def render(self, **kwargs) -> flask.Response:
+        '''Returns a new response with the placeholders filled in.'''
+        app = flask.current_app
+        json_settings = app.config.get('RESTFUL_JSON', {})
+        key = (app.debug, tuple(sorted(json_settings.items())))
+        body = self._bodies.get(key)
+        if body is None:
+            settings = dict(json_settings)
+            if app.debug:
+                settings.setdefault('indent', 4)
+            body = string.Template(
+                json.dumps({'message': self._message}, **settings) + '\n')
+            self._bodies[key] = body
+
+        if kwargs:
+            # Escape each value the way json.dumps() would, minus the quotes.
+            ensure_ascii = json_settings.get('ensure_ascii', True)
+            text = body.substitute(
+                {name: json.dumps(str(value), ensure_ascii=ensure_ascii)[1:-1]
+                 for name, value in kwargs.items()})
+        else:
+            text = body.template
+        return flask.Response(text, status=self._status, mimetype='application/json')
+
+
+GAME_FINISHED_REJECTION = RejectionTemplate(
+    HTTPStatus.FORBIDDEN, f'State: {GameStatus.GAME_FINISHED}. Game has finished. You should start listening for the next game to start.')
+NOT_ENOUGH_PLAYERS_REJECTION = RejectionTemplate(
+    HTTPStatus.FORBIDDEN, 'There are not enough players. Need 3, have $player_count players registered.')
+NOT_YOUR_TURN_REJECTION = RejectionTemplate(
+    HTTPStatus.FORBIDDEN, 'Sorry, $username, it is not your turn!')
+NOT_NEXT_REJECTION = RejectionTemplate(
+    HTTPStatus.FORBIDDEN, 'Sorry, $username is not next!')
+TOO_EARLY_REJECTION = RejectionTemplate(
+    HTTPStatus.FORBIDDEN, 'Too early. The game has not started yet.')
+NO_MESSAGES_REJECTION = RejectionTemplate(
+    HTTPStatus.NOT_FOUND, 'No messages for $username')
+
+
 class UserModelSchema(Schema):
     id = fields.Int(required=True, validate=validate.NoneOf(
         [0], error='Invalid user id: id={input} is reserved for username=admin'))
@@ -182,11 +241,9 @@ class GameManager():
     def get_player_by_name(self, username: str) -> UserModel:
         return self._user_manager.get_user_by_name(username)
 
-    def get_message_for_user(self, username: str) -> UserMessageApiResponse:
-        if username not in self._messages:
-            flask_restful.abort(HTTPStatus.NOT_FOUND,
-                                f'No messages for {username}')
-        return self._messages[username]
+    def get_message_for_user(self, username: str) -> Optional[UserMessageApiResponse]:
+        '''Returns the message sent to the user or None if there isn't one.'''
+        return self._messages.get(username, None)
 
     def set_message_for_user(self, from_username: str, to_username: str, message: str):
         if to_username in self._messages:
@@ -234,11 +291,15 @@ class Whisper(Resource):
             from_username, from_user_api_key)
 
         # Check if it's okay to play right now.
-        self._can_whisper_or_abort()
+        rejection = self._reject_if_cannot_whisper()
+        if rejection:
+            return rejection
 
         # Get the next two players to go.
-        from_user, to_user = self._get_players_or_abort(
-            from_username, to_username)
+        players = self._get_players_or_reject(from_username, to_username)
+        if isinstance(players, flask.Response):
+            return players
+        from_user, to_user = players
 
         # If we got here, the user is authorized and can whisper to the
         # recipient so we can start the game.
@@ -265,31 +326,28 @@ class Whisper(Resource):
             'game_status': self._game_manager.get_game_status().name
         }
 
-    def _can_whisper_or_abort(self) -> None:
-        '''Check if we should start or abort'''
+    def _reject_if_cannot_whisper(self) -> Optional[flask.Response]:
+        '''Returns a rejection if nobody can whisper right now, else None.'''
         # Are we in the right state?
         current_state = self._game_manager.get_game_status()
         if current_state == GameStatus.GAME_FINISHED:
-            flask_restful.abort(
-                HTTPStatus.FORBIDDEN, message=f'State: {current_state}. Game has finished. You should start listening for the next game to start.')
+            return GAME_FINISHED_REJECTION.render()
 
         # Are there enough players?
         player_count = self._game_manager.get_player_count()
         if player_count < 3:
-            flask_restful.abort(
-                HTTPStatus.FORBIDDEN, message= f'There are not enough players. Need 3, have {player_count} players registered.')
+            return NOT_ENOUGH_PLAYERS_REJECTION.render(player_count=player_count)
+        return None
 
-    def _get_players_or_abort(self, from_username, to_username) -> Tuple[UserModel, UserModel]:
-        '''Checks that the user can whisper to the other user or aborts.'''
+    def _get_players_or_reject(self, from_username, to_username) -> Union[Tuple[UserModel, UserModel], flask.Response]:
+        '''Returns the two players or a rejection if it isn't their turn.'''
         from_user = self._game_manager.get_player_by_name(from_username)
         if from_user.id != self._game_manager.get_current_player_id():
-            flask_restful.abort(HTTPStatus.FORBIDDEN,
-                                message = f'Sorry, {from_username}, it is not your turn!')
+            return NOT_YOUR_TURN_REJECTION.render(username=from_username)
 
         to_user = self._game_manager.get_player_by_name(to_username)
         if to_user.id != self._game_manager.get_next_player_id():
-            flask_restful.abort(HTTPStatus.FORBIDDEN,
-                                message=f'Sorry, {to_username} is not next!')
+            return NOT_NEXT_REJECTION.render(username=to_username)
 
         return from_user, to_user
 
@@ -312,16 +370,17 @@ class Listen(Resource):
 
         game_status = self._game_manager.get_game_status()
         if game_status == GameStatus.GAME_NOT_STARTED:
-            flask_restful.abort(HTTPStatus.FORBIDDEN,
-                                message=f'Too early. The game has not started yet.')
+            return TOO_EARLY_REJECTION.render()
 
         current_player = self._game_manager.get_current_player()
         next_player = self._game_manager.get_next_player()
 
         if current_player.username == username:
             # It's the user's turn, they should take it.
-            sent_mesage = json.dumps(
-                self._game_manager.get_message_for_user(username))
+            user_message = self._game_manager.get_message_for_user(username)
+            if user_message is None:
+                return NO_MESSAGES_REJECTION.render(username=username)
+            sent_mesage = json.dumps(user_message)
             response = flask.jsonify(
                 info=f'Hey {username}, it\'s your turn to whisper to {next_player.username}',
                 message=sent_mesage,
@@ -0,0 +1,178 @@
+'''Compare the cost of rejecting requests via abort() and via templates.
+
+Times the real Whisper and Listen endpoints on two apps given identical
+requests. One is api.create_app(), which returns RejectionTemplate responses.
+The other wires the same routes to subclasses that put back the abort-based
+checks those handlers used before.
+
+The no_messages case patches GameManager.get_message_for_user() to find
+nothing, since a listener whose turn it is always has a message in normal play.
+The old code for that case called abort() with a positional message, which
+raised a TypeError, so the aborting app uses the keyword form that was
+intended.
+
+Each pair is timed with debug off and on. main.py serves with debug=True, so
+the debug rows are the path the shipped server takes. There, Flask-RESTful indents error JSON and RejectionTemplate
+uses its cached debug body. Example:
+
+    python server/benchmark_rejections.py --iterations=20000
+'''
+
+from absl import app
+from absl import flags
+import contextlib
+import flask
+import flask_restful
+import time
+
+from http import HTTPStatus
+from typing import Dict, List, NamedTuple, Tuple
+from unittest import mock
+
+import api
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_integer('iterations', 10000,
+                     'Number of requests to send for each variant.')
+
+
+class AbortingGameManager(api.GameManager):
+    '''GameManager that aborts when there is no message, as it used to.'''
+
+    def get_message_for_user(self, username: str) -> api.UserMessageApiResponse:
+        message = super().get_message_for_user(username)
+        if message is None:
+            flask_restful.abort(HTTPStatus.NOT_FOUND,
+                                message=f'No messages for {username}')
+        return message
+
+
+class AbortingWhisper(api.Whisper):
+    '''Whisper with the abort-based turn checks it used to have.'''
+
+    def _get_players_or_reject(self, from_username, to_username) -> Tuple[api.UserModel, api.UserModel]:
+        from_user = self._game_manager.get_player_by_name(from_username)
+        if from_user.id != self._game_manager.get_current_player_id():
+            flask_restful.abort(HTTPStatus.FORBIDDEN,
+                                message=f'Sorry, {from_username}, it is not your turn!')
+
+        to_user = self._game_manager.get_player_by_name(to_username)
+        if to_user.id != self._game_manager.get_next_player_id():
+            flask_restful.abort(HTTPStatus.FORBIDDEN,
+                                message=f'Sorry, {to_username} is not next!')
+
+        return from_user, to_user
+
+
+class AbortingListen(api.Listen):
+    '''Listen with the abort-based too early check it used to have.'''
+
+    def get(self, username: str) -> api.UserMessageApiResponse:
+        api_key = self._get_request_params().get('api_key')
+        self._game_manager.is_authorized_or_abort(username, api_key)
+
+        if self._game_manager.get_game_status() == api.GameStatus.GAME_NOT_STARTED:
+            flask_restful.abort(HTTPStatus.FORBIDDEN,
+                                message=f'Too early. The game has not started yet.')
+        return super().get(username)
+
+
+def create_aborting_app(users: List[api.UserModel]) -> flask.Flask:
+    '''Like api.create_app() but with the aborting Whisper and Listen.'''
+    user_manager = api.UserManager(users)
+    game_manager = AbortingGameManager(user_manager)
+
+    flask_app = flask.Flask('benchmark_rejections')
+    aborting_api = flask_restful.Api(flask_app)
+    aborting_api.add_resource(api.Users, '/users/<string:username>',
+                              resource_class_kwargs={'user_manager': user_manager})
+    aborting_api.add_resource(AbortingListen, '/play/listen/<string:username>',
+                              resource_class_kwargs={'game_manager': game_manager})
+    aborting_api.add_resource(AbortingWhisper, '/play/whisper/<string:to_username>',
+                              resource_class_kwargs={'game_manager': game_manager})
+    return flask_app
+
+
+class Case(NamedTuple):
+    '''A rejected request and what it takes to get the game into shape.'''
+    method: str
+    path: str
+    body: dict
+    status: HTTPStatus
+    # (method, path, json) requests that set up the game state first.
+    setup: Tuple[Tuple[str, str, dict], ...] = ()
+    # Whether get_message_for_user() should find nothing.
+    no_message: bool = False
+
+
+def get_cases(users: Dict[str, api.UserModel]) -> Dict[str, Case]:
+    '''Returns the rejected requests to time by name.'''
+    first_whisper = ('POST', '/play/whisper/user02', {
+        'from_username': 'user01',
+        'api_key': users['user01'].api_key,
+        'message': 'first whisper',
+    })
+    return {
+        'not_your_turn': Case('POST', '/play/whisper/user03', {
+            'from_username': 'user02',
+            'api_key': users['user02'].api_key,
+            'message': 'out of turn',
+        }, HTTPStatus.FORBIDDEN),
+        'not_next': Case('POST', '/play/whisper/user03', {
+            'from_username': 'user01',
+            'api_key': users['user01'].api_key,
+            'message': 'wrong person',
+        }, HTTPStatus.FORBIDDEN),
+        # The empty JSON body keeps reqparse from rejecting the GET with a 415.
+        'too_early': Case('GET', f'/play/listen/user01?api_key={users["user01"].api_key}', {},
+                          HTTPStatus.FORBIDDEN),
+        'no_messages': Case('GET', f'/play/listen/user02?api_key={users["user02"].api_key}', {},
+                            HTTPStatus.NOT_FOUND, setup=(first_whisper,), no_message=True),
+    }
+
+
+def time_case(flask_app: flask.Flask, case: Case, iterations: int) -> float:
+    '''Returns the mean time per request in microseconds.'''
+    client = flask_app.test_client()
+    for method, path, body in case.setup:
+        response = client.open(path, method=method, json=body)
+        assert response.status_code == HTTPStatus.OK, response.data
+
+    patch = contextlib.nullcontext()
+    if case.no_message:
+        patch = mock.patch.object(
+            api.GameManager, 'get_message_for_user', return_value=None)
+    with patch:
+        # Warm up so first-request setup isn't counted.
+        response = client.open(case.path, method=case.method, json=case.body)
+        assert response.status_code == case.status, response.data
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.open(case.path, method=case.method, json=case.body)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv):
+    users = [
+        api.UserModel(1, 'user01', api.UserType.REGULAR, 'user01apikey'),
+        api.UserModel(2, 'user02', api.UserType.REGULAR, 'user02apikey'),
+        api.UserModel(3, 'user03', api.UserType.REGULAR, 'user03apikey'),
+    ]
+    cases = get_cases({user.username: user for user in users})
+
+    print(f'{"case":<16}{"debug":>6}{"abort us/req":>14}{"template us/req":>18}{"speedup":>10}')
+    for debug in (False, True):
+        for name, case in cases.items():
+            # Fresh apps per case since setup requests change game state.
+            abort_app = create_aborting_app(users)
+            template_app = api.create_app(users)
+            abort_app.debug = template_app.debug = debug
+            abort_us = time_case(abort_app, case, FLAGS.iterations)
+            template_us = time_case(template_app, case, FLAGS.iterations)
+            print(f'{name:<16}{str(debug):>6}{abort_us:>14.1f}{template_us:>18.1f}'
+                  f'{abort_us / template_us:>9.2f}x')
+
+
+if __name__ == '__main__':
+    app.run(main)
@@ -3,9 +3,14 @@
 from typing import List
 from marshmallow.exceptions import ValidationError
 from typing import List
+import os
 
 import api
 
+# The user config that ships next to the server.
+DEFAULT_USER_CONFIG_PATH = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), 'user_config.json')
+
 
 class InvalidConfigError(Exception):
     '''When configuration is invalid.'''
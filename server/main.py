@@ -1,21 +1,27 @@
 
 from absl import app
 from absl import flags
+import atexit
 import logging
 import os
 
 import api
 import config
+import recorder
 
 FLAGS = flags.FLAGS
 
-_DEFAULT_USER_CONFIG = os.path.join(os.path.dirname(
-    os.path.abspath(__file__)), 'user_config.json')
-
-flags.DEFINE_string('user_config_path', _DEFAULT_USER_CONFIG,
+flags.DEFINE_string('user_config_path', config.DEFAULT_USER_CONFIG_PATH,
                     ('Path to a file that contains users and their API key. The '
                      'file should contain one user/key per line separated by a '
                      'single space.'))
+flags.DEFINE_string('traffic_record_path', None,
+                    ('If set, record every request to this file so it can be '
+                     'replayed later with replay.py. API keys are redacted.'))
+flags.DEFINE_integer('traffic_record_max_bytes', 10 * 1024 * 1024,
+                     'Size at which the traffic recording is rotated.')
+flags.DEFINE_integer('traffic_record_backup_count', 5,
+                     'Number of rotated traffic recordings to keep.')
 
 
 def get_logger() -> logging.Logger:
@@ -37,7 +43,26 @@ def main(argv):
                                type=api.UserType.ADMIN, api_key=api.ADMIN_API_KEY)
     users.append(admin_user)
 
+    # With debug=True the reloader runs main() in a parent process that only
+    # watches for changes and a child that serves requests. Only the child
+    # should hold the recording open.
+    traffic_recorder = None
+    is_serving_process = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    if FLAGS.traffic_record_path and is_serving_process:
+        traffic_recorder = recorder.TrafficRecorder(
+            FLAGS.traffic_record_path,
+            max_bytes=FLAGS.traffic_record_max_bytes,
+            backup_count=FLAGS.traffic_record_backup_count)
+        # The reloader serves from a daemon thread and exits the process on
+        # reload or Ctrl+C without unwinding it, so flush queued records at
+        # interpreter exit instead.
+        atexit.register(traffic_recorder.close)
+        logger.info(
+            f'Recording traffic to \'{FLAGS.traffic_record_path}\'')
+
     flask_app = api.create_app(users)
+    if traffic_recorder:
+        traffic_recorder.install(flask_app)
     flask_app.run(debug=True)
 
 
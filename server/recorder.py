@@ -0,0 +1,143 @@
+'''Record live traffic so it can be replayed later.'''
+
+import flask
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import uuid
+
+from http import HTTPStatus
+from typing import Any, Dict, Iterator, List, Optional
+
+# A single recorded request as written to the recording file.
+TrafficRecord = Dict[str, Any]
+
+# Stands in for API keys in the recording. The replay tool swaps the real keys
+# back in from the user config.
+REDACTED = '<redacted>'
+
+_DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+_DEFAULT_BACKUP_COUNT = 5
+
+
+class TrafficRecorder():
+    '''Logs the route, timing and status of every request made to an app.
+
+    Each request becomes one compact JSON line in a size-rotated file. Writing
+    happens on a background thread so that request handlers only pay for
+    building the record and putting it on a queue.
+
+    A file can hold several server runs, e.g. after the reloader restarts the
+    server. Every record carries the id of the run that wrote it and an offset
+    from the start of that run, so the replay tool can tell runs apart.
+    '''
+
+    def __init__(self, file_path: str, max_bytes: int = _DEFAULT_MAX_BYTES,
+                 backup_count: int = _DEFAULT_BACKUP_COUNT):
+        self._session = uuid.uuid4().hex
+        self._start = time.monotonic()
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            file_path, maxBytes=max_bytes, backupCount=backup_count)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(
+            self._queue, file_handler)
+
+        # Use a private logger so records never reach the root handlers.
+        self._logger = logging.getLogger(f'whisper_server.recorder.{id(self)}')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener.start()
+
+    def install(self, app: flask.Flask) -> None:
+        '''Hooks the recorder into the app's request lifecycle.'''
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        # Teardown runs even when an exception escapes the handler, which is
+        # what happens to every unhandled error in debug mode.
+        app.teardown_request(self._teardown_request)
+
+    def close(self) -> None:
+        '''Flushes pending records to disk and stops the writer thread.'''
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+    def _before_request(self) -> None:
+        flask.g.recorder_start = time.monotonic()
+
+    def _after_request(self, response: flask.Response) -> flask.Response:
+        flask.g.recorder_status = response.status_code
+        return response
+
+    def _teardown_request(self, exception: Optional[BaseException]) -> None:
+        start = flask.g.get('recorder_start')
+        if start is None:
+            return
+        end = time.monotonic()
+        status = flask.g.get('recorder_status')
+        if exception is not None or status is None:
+            status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+        request = flask.request
+        record = {
+            'session': self._session,
+            't': round(start - self._start, 6),
+            'ms': round((end - start) * 1000, 3),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'path': request.path,
+            'view_args': request.view_args or {},
+            'args': redact(request.args.to_dict()),
+            'json': redact(request.get_json(silent=True)),
+            'status': status,
+        }
+        self._logger.info(json.dumps(record, separators=(',', ':')))
+
+
+def split_sessions(records: List[TrafficRecord]) -> List[List[TrafficRecord]]:
+    '''Groups records by the server run that wrote them, in recorded order.'''
+    sessions: Dict[Any, List[TrafficRecord]] = dict()
+    for record in records:
+        sessions.setdefault(record.get('session'), []).append(record)
+    return list(sessions.values())
+
+
+def redact(data: Any) -> Any:
+    '''Returns a copy of a request payload with any API keys replaced.'''
+    if not isinstance(data, dict):
+        return data
+    return {key: REDACTED if key == 'api_key' else value
+            for key, value in data.items()}
+
+
+def get_recording_files(file_path: str) -> List[str]:
+    '''Returns the files making up a recording, oldest first.
+
+    RotatingFileHandler moves full files to file_path.1, file_path.2, ... so the
+    highest numbered backup holds the oldest records.
+    '''
+    backups = []
+    index = 1
+    while os.path.exists(f'{file_path}.{index}'):
+        backups.append(f'{file_path}.{index}')
+        index += 1
+    files = list(reversed(backups))
+    if os.path.exists(file_path):
+        files.append(file_path)
+    return files
+
+
+def read_recording(file_path: str) -> Iterator[TrafficRecord]:
+    '''Yields every record in a recording, including rotated backups.'''
+    for path in get_recording_files(file_path):
+        with open(path, 'r') as recording_file:
+            for line in recording_file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
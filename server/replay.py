@@ -0,0 +1,217 @@
+'''Replay recorded traffic against a fresh server and report the differences.
+
+Example:
+
+    python server/main.py --traffic_record_path=/tmp/whisper.rec
+    python server/replay.py --recording_path=/tmp/whisper.rec --speed=10
+'''
+
+from absl import app
+from absl import flags
+import flask
+import json
+import time
+
+from typing import Callable, Dict, List
+
+import api
+import config
+import recorder
+
+FLAGS = flags.FLAGS
+
+# Per-route latency and error numbers produced by a replay.
+ReplayReport = Dict[str, Dict[str, float]]
+
+flags.DEFINE_string('recording_path', None,
+                    'Path to a recording made with --traffic_record_path.')
+flags.DEFINE_string('user_config_path', config.DEFAULT_USER_CONFIG_PATH,
+                    ('Path to the user config the recording was made with. '
+                     'Used to restore the redacted API keys.'))
+flags.DEFINE_float('speed', 1.0,
+                   ('How fast to replay relative to the recording, e.g. 1 or '
+                    '10. Use 0 to replay as fast as possible.'))
+flags.DEFINE_string('report_path', None,
+                    'If set, write the replay report to this file as JSON.')
+flags.DEFINE_string('baseline_report_path', None,
+                    ('A report from an earlier replay, e.g. of another build, '
+                     'to compare this replay against.'))
+
+
+class ReplayResult():
+    '''The outcome of replaying a single recorded request.'''
+
+    def __init__(self, record: recorder.TrafficRecord, status: int, ms: float):
+        self.record = record
+        self.status = status
+        self.ms = ms
+
+
+def restore_api_key(record: recorder.TrafficRecord, api_keys: Dict[str, str]) -> recorder.TrafficRecord:
+    '''Returns a copy of the record with the sender's real API key put back.
+
+    Whisper requests carry the sender in the body while listen requests carry
+    them in the path. Listen requests may still have a JSON body, e.g. {}, so
+    the path is used whenever the body has no sender.
+    '''
+    body = record.get('json')
+    args = dict(record.get('args') or {})
+    owner = None
+    if isinstance(body, dict):
+        body = dict(body)
+        owner = body.get('from_username')
+    if owner is None:
+        owner = record.get('view_args', {}).get('username')
+    api_key = api_keys.get(owner, recorder.REDACTED)
+
+    if args.get('api_key') == recorder.REDACTED:
+        args['api_key'] = api_key
+    if isinstance(body, dict) and body.get('api_key') == recorder.REDACTED:
+        body['api_key'] = api_key
+    return dict(record, args=args, json=body)
+
+
+def replay(app_factory: Callable[[], flask.Flask], records: List[recorder.TrafficRecord],
+           api_keys: Dict[str, str], speed: float = 1.0) -> List[ReplayResult]:
+    '''Sends the records to fresh apps, keeping their relative timing.
+
+    Each server run in the recording is replayed against its own app, since
+    the game state started over whenever the recorded server restarted.
+
+    Args:
+        app_factory: Returns a new app to replay against, usually by calling
+            api.create_app().
+        records: The recorded requests, oldest first.
+        api_keys: A map of username to API key used to undo the redaction.
+        speed: How much faster than recorded to go. Zero or less means don't
+            wait between requests at all.
+    Returns:
+        One result per record, grouped by server run.
+    '''
+    results = []
+    for session in recorder.split_sessions(records):
+        results.extend(_replay_session(
+            app_factory().test_client(), session, api_keys, speed))
+    return results
+
+
+def _replay_session(client, records: List[recorder.TrafficRecord], api_keys: Dict[str, str],
+                    speed: float) -> List[ReplayResult]:
+    '''Replays the records of one server run, timed from that run's start.'''
+    results = []
+    first_offset = records[0]['t']
+    replay_start = time.monotonic()
+    for record in records:
+        if speed > 0:
+            due = replay_start + (record['t'] - first_offset) / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        request = restore_api_key(record, api_keys)
+        kwargs = {}
+        if request['json'] is not None:
+            kwargs['json'] = request['json']
+        start = time.monotonic()
+        response = client.open(request['path'], method=request['method'],
+                               query_string=request['args'], **kwargs)
+        ms = (time.monotonic() - start) * 1000
+        results.append(ReplayResult(record, response.status_code, ms))
+    return results
+
+
+def summarize(results: List[ReplayResult]) -> ReplayReport:
+    '''Groups results by route and compares them against the recording.'''
+    by_route: Dict[str, List[ReplayResult]] = dict()
+    for result in results:
+        route = f'{result.record["method"]} {result.record["route"]}'
+        by_route.setdefault(route, []).append(result)
+
+    # Recorded latency is measured inside the server while replayed latency
+    # also includes the test client, so compare replayed numbers against a
+    # baseline replay rather than against the recording.
+    report = {}
+    for route, route_results in sorted(by_route.items()):
+        recorded_ms = [result.record['ms'] for result in route_results]
+        replayed_ms = [result.ms for result in route_results]
+        report[route] = {
+            'requests': len(route_results),
+            'recorded_p50_ms': _percentile(recorded_ms, 50),
+            'recorded_p95_ms': _percentile(recorded_ms, 95),
+            'replayed_p50_ms': _percentile(replayed_ms, 50),
+            'replayed_p95_ms': _percentile(replayed_ms, 95),
+            'recorded_errors': sum(
+                1 for result in route_results if result.record['status'] >= 400),
+            'replayed_errors': sum(
+                1 for result in route_results if result.status >= 400),
+            'status_mismatches': sum(
+                1 for result in route_results if result.status != result.record['status']),
+        }
+    return report
+
+
+def compare_reports(baseline: ReplayReport, current: ReplayReport) -> ReplayReport:
+    '''Returns current minus baseline for every route in either report.'''
+    diff = {}
+    for route in sorted(set(baseline) | set(current)):
+        before = baseline.get(route, {})
+        after = current.get(route, {})
+        diff[route] = {
+            'requests': after.get('requests', 0) - before.get('requests', 0),
+            'replayed_p50_ms': after.get('replayed_p50_ms', 0.0) - before.get('replayed_p50_ms', 0.0),
+            'replayed_p95_ms': after.get('replayed_p95_ms', 0.0) - before.get('replayed_p95_ms', 0.0),
+            'replayed_errors': after.get('replayed_errors', 0) - before.get('replayed_errors', 0),
+        }
+    return diff
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    '''Nearest-rank percentile. Returns 0 for an empty list.'''
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return round(ordered[index], 3)
+
+
+def _print_report(title: str, report: ReplayReport) -> None:
+    print(title)
+    for route, stats in report.items():
+        details = ', '.join(
+            f'{name}={value:.3f}' if isinstance(value, float) else f'{name}={value}'
+            for name, value in stats.items())
+        print(f'  {route}: {details}')
+
+
+def _load_report(file_path: str) -> ReplayReport:
+    with open(file_path, 'r') as report_file:
+        return json.load(report_file)
+
+
+def main(argv):
+    if not FLAGS.recording_path:
+        raise app.UsageError('--recording_path is required.')
+
+    users = config.read_user_config(FLAGS.user_config_path)
+    users.append(api.UserModel(id=0, username=api.ADMIN_USERNAME,
+                               type=api.UserType.ADMIN, api_key=api.ADMIN_API_KEY))
+    api_keys = {user.username: user.api_key for user in users}
+
+    records = list(recorder.read_recording(FLAGS.recording_path))
+    results = replay(lambda: api.create_app(users), records, api_keys,
+                     speed=FLAGS.speed)
+    report = summarize(results)
+    _print_report(f'Replayed {len(results)} requests:', report)
+
+    if FLAGS.report_path:
+        with open(FLAGS.report_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if FLAGS.baseline_report_path:
+        baseline = _load_report(FLAGS.baseline_report_path)
+        _print_report('Change from baseline (current - baseline):',
+                      compare_reports(baseline, report))
+
+
+if __name__ == '__main__':
+    app.run(main)
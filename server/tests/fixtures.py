@@ -0,0 +1,58 @@
+'''Shared test data and helpers.'''
+
+import os
+import tempfile
+
+from absl.testing import absltest
+from typing import List, Tuple
+
+from .context import server
+from server import api
+from server import recorder
+
+TEST_USER_CONFIG = r'''
+[
+  {
+    "id": 1,
+    "username": "user01",
+    "api_key": "user01apikey",
+    "type": "REGULAR"
+  },
+  {
+    "id": 2,
+    "username": "user02",
+    "api_key": "user02apikey",
+    "type": "REGULAR"
+  },
+  {
+    "id": 3,
+    "username": "user03",
+    "api_key": "user03apikey",
+    "type": "REGULAR"
+  }
+]
+'''
+
+
+def load_test_users(raw_json: str = TEST_USER_CONFIG) -> List[api.UserModel]:
+    '''Parses users the same way the server reads its user config.'''
+    return api.UserModelSchema(many=True).loads(raw_json)
+
+
+class RecordingTestCase(absltest.TestCase):
+    '''Base for tests that record traffic to a temporary file.'''
+
+    def setUp(self) -> None:
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.record_path = os.path.join(temp_dir.name, 'traffic.rec')
+        self.users = load_test_users()
+
+    def create_recorded_client(self, **recorder_kwargs) -> Tuple[recorder.TrafficRecorder, object]:
+        '''Returns a recorder and a test client for an app it's installed on.'''
+        traffic_recorder = recorder.TrafficRecorder(
+            self.record_path, **recorder_kwargs)
+        flask_app = api.create_app(self.users)
+        traffic_recorder.install(flask_app)
+        return traffic_recorder, flask_app.test_client()
@@ -11,29 +11,8 @@ from typing import Dict
 
 from .context import server
 from server import api
+from .fixtures import TEST_USER_CONFIG
 
-TEST_USER_CONFIG = r'''
-[
-  {
-    "id": 1,
-    "username": "user01",
-    "api_key": "user01apikey",
-    "type": "REGULAR"
-  },
-  {
-    "id": 2,
-    "username": "user02",
-    "api_key": "user02apikey",
-    "type": "REGULAR"
-  },
-  {
-    "id": 3,
-    "username": "user03",
-    "api_key": "user03apikey",
-    "type": "REGULAR"
-  }
-]
-''' 
 
 class GamePlayApiTest(absltest.TestCase):
     def setUp(self) -> None:
@@ -46,11 +25,11 @@ class GamePlayApiTest(absltest.TestCase):
 
         self.users = self.get_test_users(TEST_USER_CONFIG) 
 
-        app = api.create_app(list(self.users.values()))
-        app.config.update({
+        self.app = api.create_app(list(self.users.values()))
+        self.app.config.update({
             "TESTING": True,
         })
-        self.client = app.test_client()
+        self.client = self.app.test_client()
 
     def get_test_users(self, raw_json: str) -> Dict[str, api.UserModel]:
         user_factory = api.UserModelSchema(many=True)
@@ -105,6 +84,31 @@ class GamePlayApiTest(absltest.TestCase):
         self.assertEqual(data['game_status'], api.GameStatus.GAME_AWAIT_FINISH.name)
         self.assertEqual(data['current_player'], 'user02')
 
+    def test_listen_when_game_not_started_rejects_too_early(self):
+        user01_api_key = self.users['user01'].api_key
+
+        # Send an empty JSON body so reqparse doesn't reject the GET with a 415.
+        response = self.client.get(
+            f'/play/listen/user01?api_key={user01_api_key}', json={})
+
+        self.assertEqual(HTTPStatus.FORBIDDEN, response.status_code)
+        self.assertEqual(json.loads(response.data),
+                         {'message': 'Too early. The game has not started yet.'})
+
+    def test_listen_when_listeners_turn_without_message_rejects_not_found(self):
+        user01_api_key = self.users['user01'].api_key
+        user02_api_key = self.users['user02'].api_key
+        self.post_whisper('user01', user01_api_key, 'user02', 'first whisper')
+        mock.patch.object(api.GameManager, 'get_message_for_user',
+                          return_value=None).start()
+
+        response = self.client.get(
+            f'/play/listen/user02?api_key={user02_api_key}', json={})
+
+        self.assertEqual(HTTPStatus.NOT_FOUND, response.status_code)
+        self.assertEqual(json.loads(response.data),
+                         {'message': 'No messages for user02'})
+
     def test_whisper_when_waiting_for_game_end_sets_game_status_await_finish(self):
         user01_api_key = self.users['user01'].api_key
 
@@ -123,6 +127,62 @@ class GamePlayApiTest(absltest.TestCase):
         self.assertEqual(api.GameStatus.GAME_FINISHED.name,
                          whisper_response_data['game_status'])
 
+    def test_whisper_when_not_senders_turn_rejects(self):
+        user02_api_key = self.users['user02'].api_key
+        payload = json.dumps({
+            "from_username": "user02",
+            "api_key": user02_api_key,
+            "message": "out of turn"
+        })
+
+        response = self.client.post(
+            '/play/whisper/user03', headers={"Content-Type": "application/json"}, data=payload)
+
+        self.assertEqual(HTTPStatus.FORBIDDEN, response.status_code)
+        self.assertEqual(json.loads(response.data),
+                         {'message': 'Sorry, user02, it is not your turn!'})
+
+    def test_whisper_when_recipient_not_next_rejects(self):
+        user01_api_key = self.users['user01'].api_key
+        payload = json.dumps({
+            "from_username": "user01",
+            "api_key": user01_api_key,
+            "message": "wrong person"
+        })
+
+        response = self.client.post(
+            '/play/whisper/user03', headers={"Content-Type": "application/json"}, data=payload)
+
+        self.assertEqual(HTTPStatus.FORBIDDEN, response.status_code)
+        self.assertEqual(json.loads(response.data),
+                         {'message': 'Sorry, user03 is not next!'})
+
+    def test_rejection_template_escapes_values(self):
+        template = api.RejectionTemplate(
+            HTTPStatus.NOT_FOUND, 'No messages for $username')
+
+        with self.app.test_request_context():
+            response = template.render(username='a"b')
+
+        self.assertEqual(HTTPStatus.NOT_FOUND, response.status_code)
+        self.assertEqual(response.get_json(), {'message': 'No messages for a"b'})
+
+    def test_rejection_template_in_debug_mode_indents_like_abort(self):
+        self.app.debug = True
+
+        with self.app.test_request_context():
+            response = api.TOO_EARLY_REJECTION.render()
+
+        self.assertEqual(
+            response.get_data(as_text=True),
+            json.dumps({'message': 'Too early. The game has not started yet.'}, indent=4) + '\n')
+
+    def test_get_message_for_user_when_none_returns_none(self):
+        user_manager = api.UserManager(list(self.users.values()))
+        game_manager = api.GameManager(user_manager)
+
+        self.assertIsNone(game_manager.get_message_for_user('user02'))
+
     def post_whisper(self, from_username: str, api_key: str, to_username: str, message: str):
         '''Post a message from a user to another and return the response data.'''
         payload = json.dumps({
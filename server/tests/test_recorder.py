@@ -0,0 +1,90 @@
+'''Test recording traffic.'''
+
+import os
+
+from absl.testing import absltest
+from http import HTTPStatus
+
+from .context import server
+from server import api
+from server import recorder
+from . import fixtures
+
+
+class TrafficRecorderTest(fixtures.RecordingTestCase):
+
+    def test_records_route_timing_and_status(self):
+        traffic_recorder, client = self.create_recorded_client()
+
+        client.get('/users/user01')
+        client.get('/users/nobody')
+        traffic_recorder.close()
+
+        records = list(recorder.read_recording(self.record_path))
+        self.assertLen(records, 2)
+        self.assertEqual(records[0]['route'], '/users/<string:username>')
+        self.assertEqual(records[0]['path'], '/users/user01')
+        self.assertEqual(records[0]['status'], HTTPStatus.OK)
+        self.assertEqual(records[1]['status'], HTTPStatus.NOT_FOUND)
+        self.assertGreaterEqual(records[1]['t'], records[0]['t'])
+        self.assertGreaterEqual(records[0]['ms'], 0)
+
+    def test_redacts_api_keys(self):
+        traffic_recorder, client = self.create_recorded_client()
+
+        client.post('/play/whisper/user02', json={
+            'from_username': 'user01',
+            'api_key': 'user01apikey',
+            'message': 'hello',
+        })
+        client.get('/users/user01?api_key=user01apikey')
+        traffic_recorder.close()
+
+        with open(self.record_path, 'r') as record_file:
+            self.assertNotIn('user01apikey', record_file.read())
+        records = list(recorder.read_recording(self.record_path))
+        self.assertEqual(records[0]['json']['api_key'], recorder.REDACTED)
+        self.assertEqual(records[0]['json']['message'], 'hello')
+        self.assertEqual(records[1]['args']['api_key'], recorder.REDACTED)
+
+    def test_records_unhandled_errors_in_debug_mode(self):
+        traffic_recorder, client = self.create_recorded_client()
+        client.application.debug = True
+
+        # Missing api_key and message raise a KeyError inside Whisper.post.
+        with self.assertRaises(KeyError):
+            client.post('/play/whisper/user02',
+                        json={'from_username': 'user01'})
+        traffic_recorder.close()
+
+        records = list(recorder.read_recording(self.record_path))
+        self.assertLen(records, 1)
+        self.assertEqual(records[0]['status'], HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(records[0]['route'],
+                         '/play/whisper/<string:to_username>')
+
+    def test_read_recording_includes_rotated_files_oldest_first(self):
+        traffic_recorder, client = self.create_recorded_client(
+            max_bytes=300, backup_count=10)
+
+        for i in range(10):
+            client.get(f'/users/user0{i % 3 + 1}')
+        traffic_recorder.close()
+
+        self.assertGreater(
+            len(recorder.get_recording_files(self.record_path)), 1)
+        records = list(recorder.read_recording(self.record_path))
+        self.assertLen(records, 10)
+        offsets = [record['t'] for record in records]
+        self.assertEqual(offsets, sorted(offsets))
+
+    def test_app_without_recorder_writes_nothing(self):
+        client = api.create_app(self.users).test_client()
+
+        client.get('/users/user01')
+
+        self.assertFalse(os.path.exists(self.record_path))
+
+
+if __name__ == '__main__':
+    absltest.main()
@@ -0,0 +1,113 @@
+'''Test replaying recorded traffic.'''
+
+from absl.testing import absltest
+from http import HTTPStatus
+
+from .context import server
+from server import api
+from server import recorder
+from server import replay
+from . import fixtures
+
+
+class ReplayTest(fixtures.RecordingTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.api_keys = {user.username: user.api_key for user in self.users}
+
+    def record(self, requests):
+        '''Runs (method, path, json) requests against a recording app.'''
+        traffic_recorder, client = self.create_recorded_client()
+        for method, path, body in requests:
+            client.open(path, method=method, json=body)
+        traffic_recorder.close()
+        return list(recorder.read_recording(self.record_path))
+
+    def test_restore_api_key_uses_whisper_sender(self):
+        record = {
+            'path': '/play/whisper/user02',
+            'view_args': {'to_username': 'user02'},
+            'args': {},
+            'json': {'from_username': 'user01', 'api_key': recorder.REDACTED},
+        }
+
+        restored = replay.restore_api_key(record, self.api_keys)
+
+        self.assertEqual(restored['json']['api_key'], 'user01apikey')
+        self.assertEqual(record['json']['api_key'], recorder.REDACTED)
+
+    def test_restore_api_key_uses_listener_from_path(self):
+        record = {
+            'path': '/play/listen/user03',
+            'view_args': {'username': 'user03'},
+            'args': {'api_key': recorder.REDACTED},
+            # Listen polls send an empty JSON body to get past reqparse.
+            'json': {},
+        }
+
+        restored = replay.restore_api_key(record, self.api_keys)
+
+        self.assertEqual(restored['args']['api_key'], 'user03apikey')
+
+    def test_replay_reproduces_recorded_statuses(self):
+        records = self.record([
+            ('GET', '/users/user01', None),
+            ('GET', '/play/listen/user02?api_key=user02apikey', {}),
+            ('POST', '/play/whisper/user02', {
+                'from_username': 'user01',
+                'api_key': 'user01apikey',
+                'message': 'hello',
+            }),
+            ('GET', '/play/listen/user02?api_key=user02apikey', {}),
+            ('GET', '/users/nobody', None),
+        ])
+
+        results = replay.replay(
+            lambda: api.create_app(self.users), records, self.api_keys, speed=0)
+
+        self.assertEqual([record['status'] for record in records],
+                         [HTTPStatus.OK, HTTPStatus.FORBIDDEN, HTTPStatus.OK,
+                          HTTPStatus.OK, HTTPStatus.NOT_FOUND])
+        self.assertEqual([result.status for result in results],
+                         [record['status'] for record in records])
+        report = replay.summarize(results)
+        self.assertEqual(
+            report['GET /play/listen/<string:username>']['status_mismatches'], 0)
+        self.assertEqual(report['GET /users/<string:username>']['requests'], 2)
+        self.assertEqual(
+            report['GET /users/<string:username>']['replayed_errors'], 1)
+        self.assertEqual(
+            report['POST /play/whisper/<string:to_username>']['status_mismatches'], 0)
+
+    def test_replay_uses_a_fresh_app_for_each_server_run(self):
+        whisper = ('POST', '/play/whisper/user02', {
+            'from_username': 'user01',
+            'api_key': 'user01apikey',
+            'message': 'hello',
+        })
+        # Two server runs appending to the same file.
+        self.record([whisper])
+        records = self.record([whisper])
+
+        results = replay.replay(
+            lambda: api.create_app(self.users), records, self.api_keys, speed=0)
+
+        self.assertLen(recorder.split_sessions(records), 2)
+        self.assertEqual([result.status for result in results],
+                         [HTTPStatus.OK, HTTPStatus.OK])
+
+    def test_compare_reports_subtracts_baseline(self):
+        baseline = {'GET /x': {'requests': 2, 'replayed_p50_ms': 1.0,
+                               'replayed_p95_ms': 2.0, 'replayed_errors': 1}}
+        current = {'GET /x': {'requests': 2, 'replayed_p50_ms': 1.5,
+                              'replayed_p95_ms': 1.0, 'replayed_errors': 0}}
+
+        diff = replay.compare_reports(baseline, current)
+
+        self.assertEqual(diff['GET /x'], {'requests': 0, 'replayed_p50_ms': 0.5,
+                                          'replayed_p95_ms': -1.0,
+                                          'replayed_errors': -1})
+
+
+if __name__ == '__main__':
+    absltest.main()